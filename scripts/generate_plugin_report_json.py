@@ -4,75 +4,106 @@ Generate a JSON file with plugin information from various input sources.
 """
 
 import json
+import os
 import re
 import sys
+import tempfile
 import urllib.request
 import yaml
 from datetime import datetime, timedelta
+from operator import itemgetter
 
+try:
+    import orjson
+except ImportError:
+    # Fall back to the standard library parser
+    orjson = None
+
+
+# Use the libyaml-based loader if PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 UPDATE_CENTER_URL = "https://mirrors.updates.jenkins.io/current/update-center.actual.json"
+# The only plugin fields used from the update center
+PLUGIN_FIELDS = ('labels', 'popularity', 'releaseTimestamp', 'scm', 'title', 'version')
 FIVE_YEARS_AGO = datetime.now() - timedelta(days=5*365)
+# ISO 8601 timestamps sort lexicographically, so recent releases can be recognized without parsing
+FIVE_YEARS_AGO_ISO = FIVE_YEARS_AGO.strftime('%Y-%m-%dT%H:%M:%S')
+ISO_TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?Z?')
+
+
+def parse_json(raw):
+    """Parse JSON from bytes, using orjson if it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def download_update_center():
     """Download and parse the Jenkins update center JSON."""
     print("Downloading update center data...", file=sys.stderr)
     with urllib.request.urlopen(UPDATE_CENTER_URL) as response:
-        data = json.loads(response.read().decode('utf-8'))
+        data = parse_json(response.read())
     print("Downloaded successfully.", file=sys.stderr)
-    return data
-
+    return slim_update_center(data)
 
-def is_deprecated(plugin_id, plugin_data, deprecations):
-    """Check if plugin is deprecated via labels or deprecations list."""
-    # Check labels
-    labels = plugin_data.get('labels', [])
-    if 'deprecated' in labels:
-        return True
 
-    # Check deprecations list
-    if plugin_id in deprecations:
-        return True
+def slim_update_center(data):
+    """Reduce the update center data to the parts used in the report, so that the
+    rest (signature, core, dependencies, etc.) can be freed right away."""
+    plugins = {}
+    for plugin_id, plugin_info in data.get('plugins', {}).items():
+        plugins[plugin_id] = {field: plugin_info[field] for field in PLUGIN_FIELDS if field in plugin_info}
 
-    return False
+    return {
+        'plugins': plugins,
+        # Only deprecated plugin IDs are needed, not the deprecation URLs
+        'deprecations': frozenset(data.get('deprecations', {})),
+        'warnings': data.get('warnings', {}),
+    }
 
 
-def get_security_warnings(plugin_id, current_version, warnings):
-    """Get list of active security warnings for the plugin."""
-    active_warnings = []
+def build_warnings_index(warnings):
+    """Build a mapping from plugin ID to list of (compiled pattern, security ID) tuples.
+    Patterns are compiled once here so that matching per plugin is a simple lookup."""
+    warnings_by_plugin = {}
+    # Many warnings share the same version pattern, so compile each distinct one only once
+    compiled_patterns = {}
 
     # warnings is a list of warning objects
     for warning in warnings:
-        # Check if this warning is for our plugin
-        if warning.get('name') != plugin_id:
-            continue
+        plugin_id = warning.get('name')
+        security_id = warning.get('id', 'UNKNOWN')
 
-        # Check each version pattern in the warning
+        # Compile each version pattern in the warning
         for version_info in warning.get('versions', []):
             pattern = version_info.get('pattern')
             if pattern:
-                try:
-                    # Use fullmatch to match the entire version string, not just a prefix
-                    if re.fullmatch(pattern, current_version):
-                        # Get the security ID
-                        security_id = warning.get('id', 'UNKNOWN')
-                        if security_id not in active_warnings:
-                            active_warnings.append(security_id)
-                except re.error:
-                    # Invalid regex pattern, skip
-                    pass
+                if pattern not in compiled_patterns:
+                    try:
+                        compiled_patterns[pattern] = re.compile(pattern)
+                    except re.error:
+                        # Invalid regex pattern, skip
+                        compiled_patterns[pattern] = None
+                compiled = compiled_patterns[pattern]
+                if compiled is None:
+                    continue
+                warnings_by_plugin.setdefault(plugin_id, []).append((compiled, security_id))
 
-    return active_warnings
+    return warnings_by_plugin
 
 
-def get_unmaintained_status(plugin_data):
+def get_unmaintained_status(release_timestamp):
     """Check if plugin is unmaintained (5+ years since last release)."""
-    release_timestamp = plugin_data.get('releaseTimestamp')
     if not release_timestamp:
         # No release timestamp - very old
         return "Unmaintained (no release date)"
 
+    # Fast path: well-formed ISO 8601 timestamp clearly newer than the cutoff
+    if (isinstance(release_timestamp, str) and release_timestamp[:19] > FIVE_YEARS_AGO_ISO
+            and ISO_TIMESTAMP_PATTERN.fullmatch(release_timestamp)):
+        return None
+
     try:
         # Parse ISO 8601 date string (e.g., "2025-07-09T14:53:43.00Z")
         if isinstance(release_timestamp, str):
@@ -98,7 +129,7 @@ def get_unmaintained_status(plugin_data):
     return None
 
 
-def compute_notes(plugin_id, plugin_data, deprecations, warnings, plugin_notes):
+def compute_notes(plugin_id, plugin_data, deprecations, warnings_by_plugin, plugin_notes):
     """Compute notes list for a plugin and concatenate into a string."""
     notes_list = []
 
@@ -107,23 +138,27 @@ def compute_notes(plugin_id, plugin_data, deprecations, warnings, plugin_notes):
     if custom_note:
         notes_list.append(custom_note)
 
-    # Check if deprecated
-    if is_deprecated(plugin_id, plugin_data, deprecations):
+    labels = plugin_data.get('labels', [])
+
+    # Check if deprecated via labels or deprecations list
+    if 'deprecated' in labels or plugin_id in deprecations:
         notes_list.append("Deprecated")
 
     # Check for "adopt-this-plugin" label
-    labels = plugin_data.get('labels', [])
     if 'adopt-this-plugin' in labels:
         notes_list.append("Looking for maintainers")
 
-    # Check for security warnings
+    # Check for active security warnings
     current_version = plugin_data.get('version', '')
-    security_warnings = get_security_warnings(plugin_id, current_version, warnings)
-    for security_id in security_warnings:
-        notes_list.append(f"Unresolved {security_id}")
+    seen_warnings = set()
+    for compiled, security_id in warnings_by_plugin.get(plugin_id, ()):
+        # Use fullmatch to match the entire version string, not just a prefix
+        if security_id not in seen_warnings and compiled.fullmatch(current_version):
+            seen_warnings.add(security_id)
+            notes_list.append(f"Unresolved {security_id}")
 
     # Check if unmaintained
-    unmaintained_status = get_unmaintained_status(plugin_data)
+    unmaintained_status = get_unmaintained_status(plugin_data.get('releaseTimestamp'))
     if unmaintained_status:
         notes_list.append(unmaintained_status)
 
@@ -131,154 +166,160 @@ def compute_notes(plugin_id, plugin_data, deprecations, warnings, plugin_notes):
 
 
 def load_yaml_file(filename):
-    """Load and parse a YAML file."""
+    """Load and parse a YAML file.
+    The parsed content is cached in a JSON file next to it (e.g. 'issues.yaml.json'),
+    which is used instead as long as it is not older than the YAML file."""
+    cache_filename = filename + '.json'
+    try:
+        if os.stat(cache_filename).st_mtime_ns >= os.stat(filename).st_mtime_ns:
+            return load_json_file(cache_filename)
+    except (OSError, ValueError):
+        # No usable cache, parse the YAML file
+        pass
+
     with open(filename, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        data = yaml.load(f, Loader=YAML_LOADER)
 
+    # Write the cache atomically so an interrupted run cannot leave a truncated file behind
+    try:
+        fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(cache_filename) or '.', suffix='.tmp')
+    except OSError:
+        # Caching is only an optimization
+        return data
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_filename, cache_filename)
+    except (OSError, TypeError, ValueError):
+        # Not writable, or content (e.g. dates) that JSON cannot represent
+        os.remove(tmp_filename)
 
-def load_json_file(filename):
-    """Load and parse a JSON file."""
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def count_issues_without_release(plugin_id, issues_data):
-    """Count findings in issues.yaml that don't have a 'release' key.
-    Returns the count if plugin is found in the data, None otherwise."""
-    for entry in issues_data:
-        if entry.get('id') == plugin_id:
-            count = 0
-            findings = entry.get('findings', [])
-            for finding in findings:
-                if 'release' not in finding:
-                    count += 1
-            return count
-    return None
+    return data
 
 
-def get_issue_details(plugin_id, issues_data):
-    """Get detailed issue information for a plugin.
-    Returns a list of issue details if plugin is found, None otherwise."""
-    for entry in issues_data:
-        if entry.get('id') == plugin_id:
-            findings = entry.get('findings', [])
-            issue_details = []
-            for finding in findings:
-                # Only include findings without a release
-                if 'release' not in finding:
-                    detail = {}
-                    # Get issue URL (can be 'issue' or 'url' key)
-                    if 'issue' in finding:
-                        detail['issue'] = finding['issue']
-                    elif 'url' in finding:
-                        detail['issue'] = finding['url']
-
-                    # Get fix URL (PR or commit)
-                    if 'fix' in finding:
-                        detail['fix'] = finding['fix']
-
-                    # Only add if we have an issue URL
-                    if 'issue' in detail:
-                        issue_details.append(detail)
-
-            return issue_details if issue_details else None
-    return None
+def write_json_file(filename, data):
+    """Write data as indented JSON, using orjson if it is installed."""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
 
 
-def build_repo_to_plugins_map(update_center_data):
-    """Build a mapping from repository name to list of plugin IDs.
-    Repository name is extracted from SCM URL (e.g., 'script-security-plugin' from
-    'https://github.com/jenkinsci/script-security-plugin')."""
-    repo_map = {}
+def load_json_file(filename):
+    """Load and parse a JSON file."""
+    with open(filename, 'rb') as f:
+        return parse_json(f.read())
+
+
+def index_entries(entries, key):
+    """Build a mapping from the given key (e.g. 'id' or 'repo') to its entry.
+    If a key appears more than once, the first entry wins."""
+    index = {}
+    for entry in entries:
+        if key in entry:
+            index.setdefault(entry[key], entry)
+    return index
+
+
+def summarize_issues(entry):
+    """Count findings of an issues.yaml entry that don't have a 'release' key, and collect
+    their details in the same pass.
+    Returns a (count, details) tuple; count is None if there is no entry for the plugin,
+    details is None if there are no unreleased findings with an issue URL."""
+    if entry is None:
+        return None, None
+
+    count = 0
+    issue_details = []
+    for finding in entry.get('findings', []):
+        # Only count and include findings without a release
+        if 'release' in finding:
+            continue
+        count += 1
 
-    plugins = update_center_data.get('plugins', {})
-    for plugin_id, plugin_info in plugins.items():
-        scm_url = plugin_info.get('scm', '')
-        if scm_url:
-            # Extract repository name from SCM URL
-            # Handle both https://github.com/jenkinsci/repo-name and
-            # https://github.com/jenkinsci/repo-name.git
-            parts = scm_url.rstrip('/').rstrip('.git').split('/')
-            if len(parts) >= 2:
-                repo_name = parts[-1]
-                if repo_name not in repo_map:
-                    repo_map[repo_name] = []
-                repo_map[repo_name].append(plugin_id)
+        detail = {}
+        # Get issue URL (can be 'issue' or 'url' key)
+        if 'issue' in finding:
+            detail['issue'] = finding['issue']
+        elif 'url' in finding:
+            detail['issue'] = finding['url']
 
-    return repo_map
+        # Get fix URL (PR or commit)
+        if 'fix' in finding:
+            detail['fix'] = finding['fix']
 
+        # Only add if we have an issue URL
+        if 'issue' in detail:
+            issue_details.append(detail)
 
-def count_scanner_findings(plugin_id, scanner_data, repo_to_plugins_map, update_center_data):
-    """Count findings in csp-scanner.yaml that don't have 'False Positive' assessment.
-    csp-scanner.yaml uses repository names, not plugin IDs, so we need to map them.
-    Returns the count if plugin is found in the data, None otherwise."""
+    return count, (issue_details if issue_details else None)
 
-    # Get the SCM URL for this plugin
-    plugin_info = update_center_data.get('plugins', {}).get(plugin_id, {})
-    scm_url = plugin_info.get('scm', '')
 
+def repo_name_from_scm(scm_url):
+    """Extract the repository name from an SCM URL (e.g., 'script-security-plugin' from
+    'https://github.com/jenkinsci/script-security-plugin').
+    Returns None if there is no SCM URL or no repository name can be extracted."""
     if not scm_url:
         return None
 
-    # Extract repository name from SCM URL
-    parts = scm_url.rstrip('/').rstrip('.git').split('/')
-    if len(parts) < 2:
+    # Handle both https://github.com/jenkinsci/repo-name and
+    # https://github.com/jenkinsci/repo-name.git
+    # (rstrip would strip any trailing '.', 'g', 'i' and 't' characters, not the suffix)
+    # Only the last path component is needed, so avoid splitting the whole URL
+    _, separator, repo_name = scm_url.removesuffix('/').removesuffix('.git').removesuffix('/').rpartition('/')
+    if not separator:
         return None
 
-    repo_name = parts[-1]
+    return repo_name
 
-    # Look for this repository name in scanner data
-    for entry in scanner_data:
-        if entry.get('repo') == repo_name:
-            count = 0
-            findings = entry.get('findings') or []  # Handle None case
-            for finding in findings:
-                assessment = finding.get('assessment')
-                if assessment != 'False Positive':
-                    count += 1
-            return count
 
-    return None
-
-
-def get_scanner_details(plugin_id, scanner_data, repo_to_plugins_map, update_center_data):
-    """Get detailed scanner finding information for a plugin.
-    Returns a list of scanner finding URLs with type if plugin is found, None otherwise."""
-
-    # Get the SCM URL for this plugin
-    plugin_info = update_center_data.get('plugins', {}).get(plugin_id, {})
-    scm_url = plugin_info.get('scm', '')
-
-    if not scm_url:
-        return None
+def build_repo_to_plugins_map(update_center_data):
+    """Build a mapping from repository name to list of plugin IDs, and from plugin ID
+    to repository name, in one pass over the plugins.
+    Repository name is extracted from SCM URL, see repo_name_from_scm.
+    Returns a (repo_map, repo_name_by_plugin) tuple; plugins without a repository
+    name are not included in either."""
+    repo_map = {}
+    repo_name_by_plugin = {}
 
-    # Extract repository name from SCM URL
-    parts = scm_url.rstrip('/').rstrip('.git').split('/')
-    if len(parts) < 2:
-        return None
+    plugins = update_center_data.get('plugins', {})
+    for plugin_id, plugin_info in plugins.items():
+        repo_name = repo_name_from_scm(plugin_info.get('scm', ''))
+        if repo_name is not None:
+            repo_name_by_plugin[plugin_id] = repo_name
+            repo_map.setdefault(repo_name, []).append(plugin_id)
+
+    return repo_map, repo_name_by_plugin
+
+
+def summarize_scanner(entry):
+    """Count findings of a csp-scanner.yaml entry that don't have 'False Positive' assessment,
+    and collect their URLs with type in the same pass.
+    Returns a (count, details) tuple; count is None if there is no entry for the plugin,
+    details is None if there are no such findings with a URL."""
+    if entry is None:
+        return None, None
+
+    count = 0
+    scanner_details = []
+    findings = entry.get('findings') or []  # Handle None case
+    for finding in findings:
+        # Only count and include findings that are not marked as False Positive
+        if finding.get('assessment') == 'False Positive':
+            continue
+        count += 1
 
-    repo_name = parts[-1]
-
-    # Look for this repository name in scanner data
-    for entry in scanner_data:
-        if entry.get('repo') == repo_name:
-            findings = entry.get('findings') or []  # Handle None case
-            scanner_details = []
-            for finding in findings:
-                assessment = finding.get('assessment')
-                # Only include findings that are not marked as False Positive
-                if assessment != 'False Positive':
-                    url = finding.get('url')
-                    finding_type = finding.get('type', 'Unknown')
-                    if url:
-                        scanner_details.append({
-                            'url': url,
-                            'type': finding_type
-                        })
-
-            return scanner_details if scanner_details else None
+        url = finding.get('url')
+        finding_type = finding.get('type', 'Unknown')
+        if url:
+            scanner_details.append({
+                'url': url,
+                'type': finding_type
+            })
 
-    return None
+    return count, (scanner_details if scanner_details else None)
 
 
 def main():
@@ -296,18 +337,27 @@ def main():
     print(f"Loaded {len(issues_data)} entries from issues.yaml")
     print(f"Loaded {len(scanner_data)} entries from csp-scanner.yaml")
 
+    # Index issues by plugin ID and scanner results by repository name
+    issues_by_id = index_entries(issues_data, 'id')
+    scanner_by_repo = index_entries(scanner_data, 'repo')
+
     # Extract plugins, deprecations, and warnings from update center
     plugins = update_center_data.get('plugins', {})
-    deprecations = update_center_data.get('deprecations', {})
+    deprecations = update_center_data.get('deprecations', frozenset())
     warnings = update_center_data.get('warnings', {})
     print(f"Found {len(plugins)} plugins in update center")
 
+    # Index security warnings by plugin ID
+    warnings_by_plugin = build_warnings_index(warnings)
+
     # Build repository to plugin ID mapping for scanner data
-    repo_to_plugins_map = build_repo_to_plugins_map(update_center_data)
+    repo_to_plugins_map, repo_name_by_plugin = build_repo_to_plugins_map(update_center_data)
     print(f"Built mapping for {len(repo_to_plugins_map)} repositories")
 
-    # Generate the output list
+    # Generate the output list, collecting statistics along the way
     output_list = []
+    total_issues = total_scanner = 0
+    plugins_with_notes = plugins_with_issues = plugins_with_scanner = 0
 
     for plugin_id, plugin_info in plugins.items():
         # Extract required fields
@@ -317,13 +367,13 @@ def main():
         display_name = plugin_info.get('title', '')
 
         # Count issues and scanner findings (None if not in source file)
-        issues_count = count_issues_without_release(plugin_id, issues_data)
-        scanner_count = count_scanner_findings(plugin_id, scanner_data, repo_to_plugins_map, update_center_data)
-        issue_details = get_issue_details(plugin_id, issues_data)
-        scanner_details = get_scanner_details(plugin_id, scanner_data, repo_to_plugins_map, update_center_data)
+        issues_count, issue_details = summarize_issues(issues_by_id.get(plugin_id))
+        # csp-scanner.yaml uses repository names, not plugin IDs
+        repo_name = repo_name_by_plugin.get(plugin_id)
+        scanner_count, scanner_details = summarize_scanner(scanner_by_repo.get(repo_name))
 
         # Compute notes
-        notes_str = compute_notes(plugin_id, plugin_info, deprecations, warnings, plugin_notes_data)
+        notes_str = compute_notes(plugin_id, plugin_info, deprecations, warnings_by_plugin, plugin_notes_data)
 
         # Create entry - only include issues/scanner if they exist in source files
         entry = {
@@ -335,11 +385,18 @@ def main():
             'scm': scm_url
         }
 
+        if notes_str:
+            plugins_with_notes += 1
+
         # Add issues/scanner only if present in source data
         if issues_count is not None:
             entry['issues'] = issues_count
+            total_issues += issues_count
+            plugins_with_issues += 1
         if scanner_count is not None:
             entry['scanner'] = scanner_count
+            total_scanner += scanner_count
+            plugins_with_scanner += 1
         # Add issue details if present
         if issue_details is not None:
             entry['issueDetails'] = issue_details
@@ -350,22 +407,15 @@ def main():
         output_list.append(entry)
 
     # Sort by popularity (descending) for better readability
-    output_list.sort(key=lambda x: x['popularity'], reverse=True)
+    output_list.sort(key=itemgetter('popularity'), reverse=True)
 
     # Write to output file
     output_filename = 'output/plugin_report.json'
-    with open(output_filename, 'w', encoding='utf-8') as f:
-        json.dump(output_list, f, indent=2, ensure_ascii=False)
+    write_json_file(output_filename, output_list)
 
     print(f"\nGenerated {output_filename} with {len(output_list)} entries")
 
     # Print some statistics
-    total_issues = sum(e.get('issues', 0) for e in output_list)
-    total_scanner = sum(e.get('scanner', 0) for e in output_list)
-    plugins_with_notes = sum(1 for e in output_list if e['notes'])
-    plugins_with_issues = sum(1 for e in output_list if 'issues' in e)
-    plugins_with_scanner = sum(1 for e in output_list if 'scanner' in e)
-
     print(f"\nStatistics:")
     print(f"  Total plugins: {len(output_list)}")
     print(f"  Plugins in issues file: {plugins_with_issues}")